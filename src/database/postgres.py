@@ -1,15 +1,26 @@
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from typing import AsyncGenerator
 from settings import config
 
 
 # Создание async engine
+# Кэши prepared statements отключены: совместимо с PgBouncer (transaction pooling)
+# и не даёт Postgres переключаться на неудачный generic plan
 async_engine = create_async_engine(
-    url=config.database_url_asyncpg,
-    echo=config.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    url=make_url(config.database_url_asyncpg).update_query_dict(
+        {"prepared_statement_cache_size": "0"}
+    ),
+    echo=config.DB_ECHO,
+    # pre-ping - лишний round-trip на каждый запрос; по умолчанию выключен,
+    # соединения обновляются через pool_recycle
+    pool_pre_ping=config.DB_POOL_PRE_PING,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    pool_recycle=config.DB_POOL_RECYCLE,
+    connect_args={"statement_cache_size": 0},
+    query_cache_size=1200,
 )
 
 async_session_factory = async_sessionmaker(
@@ -1,40 +1,67 @@
-from typing import Annotated, AsyncGenerator
+from typing import Annotated, Awaitable, Callable
 from fastapi import Depends, HTTPException, status, Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from database.postgres import async_session_factory
 
 from repositories import UserRepository, ImpUserRepository
 from services import UserService, ImpUserService
 from repositories import UserRepository
-from utils.jwt import verify_token
+from utils.jwt import verify_token_cached
+from utils.cache import user_cache
+from utils.cookies import get_cookie
 from models import UserModel
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency для получения сессии БД"""
-    async with async_session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+# Заголовки 401 ответа создаются один раз. Сами исключения - заново при
+# каждом raise: повторный raise одного экземпляра наращивает его __traceback__
+# и держит в памяти кадры (и их локальные переменные) всех прошлых запросов
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+
+# Колонки пользователя, копируемые в кэш
+_USER_COLUMN_KEYS = tuple(attr.key for attr in inspect(UserModel).column_attrs)
+
+
+def _detached_copy(user: UserModel) -> UserModel:
+    """
+    Копия пользователя, не привязанная к сессии
+
+    В кэш нельзя класть объект сессии запроса: при откате (ответ >= 400)
+    его атрибуты истекают, и следующий запрос получит DetachedInstanceError
+    """
+    return UserModel(**{key: getattr(user, key) for key in _USER_COLUMN_KEYS})
+
+
+def get_async_session(request: Request) -> AsyncSession:
+    """Dependency для получения сессии БД, открытой middleware на время запроса"""
+    return request.state.db
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Dependency для получения фабрики отдельных сессий БД"""
+    return async_session_factory
 
 
 def get_user_repository(
     session: Annotated[AsyncSession, Depends(get_async_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_async_session_factory)
+    ],
 ) -> UserRepository:
     """Dependency для получения репозитория пользователей"""
-    return ImpUserRepository(session)
+    return ImpUserRepository(session, session_factory)
 
 
 def get_user_service(
-    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_async_session_factory)
+    ],
 ) -> UserService:
     """Dependency для получения сервиса пользователей"""
-    return ImpUserService(repository)
+    # Репозиторий создаётся напрямую, без отдельного узла Depends
+    return ImpUserService(ImpUserRepository(session, session_factory))
 
 
 async def get_current_user(
@@ -57,34 +84,39 @@ async def get_current_user(
         HTTPException: 401 если токен невалидный или пользователь не найден
     """
     # Получаем токен из cookies
-    access_token = request.cookies.get("access_token")
+    access_token = get_cookie(request, "access_token")
 
     if not access_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=_BEARER_HEADERS,
         )
 
     # Проверяем токен
-    token_data = verify_token(access_token, token_type="access")
+    token_data = await verify_token_cached(access_token, token_type="access")
 
     if token_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=_BEARER_HEADERS,
         )
 
-    # Получаем пользователя из БД
-    user = await user_repository.get_by_email(token_data.email)
+    # Получаем пользователя из кэша, при промахе - из БД
+    user = user_cache.get(token_data.user_id)
 
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if user is None or user.email != token_data.email:
+        user = await user_repository.get_by_email(token_data.email)
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers=_BEARER_HEADERS,
+            )
+
+        user_cache.set(user.id, _detached_copy(user))
 
     # Проверяем активность
     if not user.is_active:
@@ -95,45 +127,29 @@ async def get_current_user(
     return user
 
 
-async def get_current_active_user(
-    current_user: Annotated[UserModel, Depends(get_current_user)],
-) -> UserModel:
+def require_user(*, admin: bool = False) -> Callable[..., Awaitable[UserModel]]:
     """
-    Получить текущего активного пользователя
+    Фабрика dependency для текущего пользователя с нужными правами
 
-    Args:
-        current_user: Текущий пользователь
-
-    Returns:
-        UserModel: Активный пользователь
-
-    Raises:
-        HTTPException: 403 если пользователь неактивен
-    """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
-        )
-    return current_user
-
-
-async def get_current_admin_user(
-    current_user: Annotated[UserModel, Depends(get_current_active_user)],
-) -> UserModel:
-    """
-    Получить текущего пользователя-администратора
+    get_current_user уже проверяет активность, поэтому для обычного
+    пользователя он возвращается как есть, без дополнительного узла в графе
 
     Args:
-        current_user: Текущий активный пользователь
+        admin: Требовать права администратора
 
     Returns:
-        UserModel: Пользователь-администратор
-
-    Raises:
-        HTTPException: 403 если пользователь не администратор
+        Dependency, возвращающая текущего пользователя
     """
-    if not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
-        )
-    return current_user
+    if not admin:
+        return get_current_user
+
+    async def get_current_admin_user(
+        current_user: Annotated[UserModel, Depends(get_current_user)],
+    ) -> UserModel:
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+            )
+        return current_user
+
+    return get_current_admin_user
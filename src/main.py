@@ -1,9 +1,46 @@
+import asyncio
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from uuid import uuid4
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from routers import user, auth
-from database.postgres import async_engine
+from database.postgres import async_engine, async_session_factory
+from settings import config
+from repositories import ImpUserRepository
+
+
+# Логирование через очередь: форматирование и вывод выполняются
+# в отдельном потоке QueueListener, а не в event loop
+log_queue: Queue = Queue(-1)
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+)
+queue_listener = QueueListener(log_queue, log_handler)
+
+logger = logging.getLogger("app")
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(log_queue))
+logger.propagate = False
+
+
+async def warm_up_query_cache() -> None:
+    """
+    Выполнить типовые запросы репозитория с фиктивными значениями,
+    чтобы SQLAlchemy скомпилировал их до первого реального запроса
+    """
+    async with async_session_factory() as session:
+        repository = ImpUserRepository(session)
+        await repository.get_by_email("")
+        await repository.get_by_uuid(uuid4())
+        await repository.list_light(skip=0, limit=1)
+        await repository.list_light(skip=0, limit=1, is_active=True)
+        await repository.exists(uuid4())
+        await repository.count()
 
 
 @asynccontextmanager
@@ -14,22 +51,33 @@ async def lifespan(app: FastAPI):
     - shutdown: действия при остановке приложения
     """
     # Startup - код выполняется при запуске
-    print("🚀 Starting up application...")
+    queue_listener.start()
+    logger.info("Starting up application...")
 
     # Здесь можно инициализировать соединения, кэши и т.д.
     # Например, проверка подключения к БД
     try:
         async with async_engine.begin():
-            print("✅ Database connection established")
+            logger.info("Database connection established")
+
+        # Прогрев пула: заранее открываем pool_size соединений,
+        # чтобы первые запросы не тратили время на подключение
+        connections = await asyncio.gather(
+            *(async_engine.connect() for _ in range(config.DB_POOL_SIZE))
+        )
+        await asyncio.gather(*(connection.close() for connection in connections))
+
+        await warm_up_query_cache()
     except Exception as e:
-        print(f"❌ Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
 
     yield  # Приложение работает
 
     # Shutdown - код выполняется при остановке
-    print("🛑 Shutting down application...")
+    logger.info("Shutting down application...")
     await async_engine.dispose()
-    print("✅ Database connections closed")
+    logger.info("Database connections closed")
+    queue_listener.stop()
 
 
 # Создание FastAPI приложения
@@ -38,20 +86,40 @@ app = FastAPI(
     description="API для управления пользователями с использованием Repository и Service паттернов",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
 )
 
 
-# Настройка CORS (если необходимо для frontend)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # В production укажите конкретные домены
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Настройка CORS: только явно разрешённые origins из настроек.
+# Если список пуст, middleware не подключается вовсе
+if config.cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.cors_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PATCH", "DELETE"],
+        allow_headers=["Content-Type", "Authorization"],
+    )
+
+
+# Одна сессия БД на запрос: коммит при успешном ответе, иначе откат
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    async with async_session_factory() as session:
+        request.state.db = session
+        try:
+            response = await call_next(request)
+        except Exception:
+            await session.rollback()
+            raise
+        if response.status_code < 400:
+            await session.commit()
+        else:
+            await session.rollback()
+        return response
 
 
 # Подключение роутеров
@@ -81,7 +149,7 @@ async def health_check():
 # Обработчик ошибок 404 - ИСПРАВЛЕНО
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={
             "error": "Not Found",
@@ -94,7 +162,7 @@ async def not_found_handler(request: Request, exc):
 # Обработчик ошибок 500 - ИСПРАВЛЕНО
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
@@ -104,12 +172,16 @@ async def internal_error_handler(request: Request, exc):
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
 
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,  # Автоперезагрузка при изменении кода (только для development)
+        loop="uvloop",
+        http="httptools",
+        reload=config.debug,  # Автоперезагрузка при изменении кода (только для development)
+        workers=None if config.debug else os.cpu_count(),
         log_level="info",
     )
@@ -1,8 +1,9 @@
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase
-from sqlalchemy import String, func
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.sql.sqltypes import TIMESTAMP
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime
 
 
@@ -15,8 +16,8 @@ class BaseModelSql(Base):
     __abstract__ = True
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    uuid: Mapped[str] = mapped_column(
-        String(36), unique=True, default=lambda: str(uuid4())
+    uuid: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True), unique=True, default=uuid4
     )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=func.now()
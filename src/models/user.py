@@ -1,11 +1,16 @@
 from typing import Optional
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, Index
 from models.base import BaseModelSql
 
 
 class UserModel(BaseModelSql):
+    __table_args__ = (
+        # Страницы активных пользователей: фильтр по is_active + сортировка по id
+        Index("ix_usermodel_is_active_id", "is_active", "id"),
+    )
+
     user_name: Mapped[str] = mapped_column(
         String(50),
         unique=True,
@@ -1,15 +1,27 @@
 from typing import Protocol, Optional, List
 from uuid import UUID
-from sqlalchemy import select, update, delete, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, select, insert, update, delete, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from database.postgres import async_session_factory
 from models import UserModel
+from utils.cache import user_cache
+
+# Колонки пользователя, которые отдаются наружу (всё, кроме хеша пароля)
+_USER_PUBLIC_COLUMNS = tuple(
+    column for column in UserModel.__table__.columns if column.key != "hashed_password"
+)
 
 
 class UserRepository(Protocol):
     """Протокол для репозитория пользователей с async методами"""
 
-    async def create(self, user: UserModel) -> UserModel:
-        """Создать нового пользователя"""
+    async def create(self, user: dict) -> Optional[UserModel]:
+        """Создать нового пользователя. None если email уже занят"""
+        ...
+
+    async def create_many(self, users: List[dict]) -> List[UserModel]:
+        """Создать нескольких пользователей одним INSERT"""
         ...
 
     async def get_by_uuid(self, user_uuid: UUID) -> Optional[UserModel]:
@@ -20,15 +32,27 @@ class UserRepository(Protocol):
         """Получить пользователя по email"""
         ...
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[UserModel]:
-        """Получить список всех пользователей с пагинацией"""
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
+    ) -> List[UserModel]:
+        """Получить список пользователей с пагинацией (опционально по is_active)"""
+        ...
+
+    async def list_light(
+        self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
+    ) -> List[Row]:
+        """Получить страницу пользователей в виде строк без ORM-объектов"""
         ...
 
     async def update(self, user_uuid: UUID, **kwargs) -> Optional[UserModel]:
         """Обновить данные пользователя"""
         ...
 
-    async def delete(self, user_uuid: UUID) -> bool:
+    async def set_active(self, user_uuid: UUID, is_active: bool) -> Optional[UserModel]:
+        """Сменить статус активности. None если не найден или статус уже такой"""
+        ...
+
+    async def delete(self, user_uuid: UUID, *, keep_active_admin: bool = False) -> bool:
         """Удалить пользователя. Возвращает True если удален, False если не найден"""
         ...
 
@@ -44,21 +68,39 @@ class UserRepository(Protocol):
 class ImpUserRepository:
     """Реализация репозитория пользователей с async SQLAlchemy"""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ):
         self.session = session
+        # Фабрика для запросов, которые идут параллельно с запросами сессии
+        self.session_factory = session_factory
 
-    async def create(self, user: UserModel) -> UserModel:
-        """Создать нового пользователя"""
-        self.session.add(user)
-        await self.session.flush()
-        await self.session.refresh(user)
-        return user
+    async def create(self, user: dict) -> Optional[UserModel]:
+        """Создать нового пользователя. None если email уже занят"""
+        # Проверка уникальности email и вставка - один атомарный запрос
+        stmt = (
+            pg_insert(UserModel)
+            .values(**user)
+            .on_conflict_do_nothing(index_elements=[UserModel.email])
+            .returning(UserModel)
+        )
+        result = await self.session.scalars(stmt)
+        return result.one_or_none()
+
+    async def create_many(self, users: List[dict]) -> List[UserModel]:
+        """Создать нескольких пользователей одним INSERT"""
+        result = await self.session.scalars(
+            insert(UserModel).returning(UserModel, sort_by_parameter_order=True),
+            users,
+        )
+        return list(result.all())
 
     async def get_by_uuid(self, user_uuid: UUID) -> Optional[UserModel]:
         """Получить пользователя по UUID"""
-        # Преобразуем UUID в строку для сравнения
         result = await self.session.execute(
-            select(UserModel).where(UserModel.uuid == str(user_uuid))
+            select(UserModel).where(UserModel.uuid == user_uuid)
         )
         return result.scalar_one_or_none()
 
@@ -69,43 +111,92 @@ class ImpUserRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[UserModel]:
-        """Получить список всех пользователей с пагинацией"""
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
+    ) -> List[UserModel]:
+        """Получить список пользователей с пагинацией (опционально по is_active)"""
+        stmt = select(UserModel)
+        if is_active is not None:
+            stmt = stmt.where(UserModel.is_active == is_active)
         result = await self.session.execute(
-            select(UserModel).offset(skip).limit(limit).order_by(UserModel.id)
+            stmt.offset(skip).limit(limit).order_by(UserModel.id)
         )
         return list(result.scalars().all())
 
+    async def list_light(
+        self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
+    ) -> List[Row]:
+        """Получить страницу пользователей в виде строк без ORM-объектов"""
+        # Core-запрос по колонкам: без identity map и инструментации атрибутов
+        stmt = select(*_USER_PUBLIC_COLUMNS)
+        if is_active is not None:
+            stmt = stmt.where(UserModel.is_active == is_active)
+        result = await self.session.execute(
+            stmt.offset(skip).limit(limit).order_by(UserModel.id)
+        )
+        return list(result.all())
+
     async def update(self, user_uuid: UUID, **kwargs) -> Optional[UserModel]:
         """Обновить данные пользователя"""
         stmt = (
             update(UserModel)
-            .where(UserModel.uuid == str(user_uuid))
+            .where(UserModel.uuid == user_uuid)
             .values(**kwargs)
             .returning(UserModel)
         )
         result = await self.session.execute(stmt)
-        await self.session.flush()
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None:
+            user_cache.pop(user.id)
+        return user
 
-    async def delete(self, user_uuid: UUID) -> bool:
-        """Удалить пользователя. Возвращает True если удален, False если не найден"""
-        stmt = delete(UserModel).where(UserModel.uuid == str(user_uuid))
+    async def set_active(self, user_uuid: UUID, is_active: bool) -> Optional[UserModel]:
+        """Сменить статус активности. None если не найден или статус уже такой"""
+        # Проверка текущего статуса и обновление - один UPDATE
+        stmt = (
+            update(UserModel)
+            .where(UserModel.uuid == user_uuid, UserModel.is_active != is_active)
+            .values(is_active=is_active)
+            .returning(UserModel)
+        )
         result = await self.session.execute(stmt)
-        await self.session.flush()
-        return result.rowcount > 0
+        user = result.scalar_one_or_none()
+        if user is not None:
+            user_cache.pop(user.id)
+        return user
+
+    async def delete(self, user_uuid: UUID, *, keep_active_admin: bool = False) -> bool:
+        """
+        Удалить пользователя. Возвращает True если удален, False если не найден
+
+        При keep_active_admin=True активный админ не удаляется (вернётся False)
+        """
+        stmt = delete(UserModel).where(UserModel.uuid == user_uuid)
+        if keep_active_admin:
+            stmt = stmt.where(~(UserModel.is_admin & UserModel.is_active))
+        result = await self.session.execute(stmt.returning(UserModel.id))
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            return False
+        user_cache.pop(user_id)
+        return True
 
     async def exists(self, user_uuid: UUID) -> bool:
         """Проверить существование пользователя"""
         result = await self.session.execute(
-            select(func.count())
-            .select_from(UserModel)
-            .where(UserModel.uuid == str(user_uuid))
+            select(literal(1)).where(UserModel.uuid == user_uuid).limit(1)
         )
-        count = result.scalar()
-        return count > 0
+        return result.scalar() is not None
 
     async def count(self) -> int:
         """Получить общее количество пользователей"""
-        result = await self.session.execute(select(func.count()).select_from(UserModel))
-        return result.scalar()
+        # Своя сессия (и соединение): COUNT(*) может идти параллельно
+        # с другими запросами сессии запроса (например, со страницей списка).
+        # Цена - второе соединение из пула на время запроса: при расчёте
+        # DB_POOL_SIZE учитывайте, что /users/page занимает два соединения.
+        # Счётчик читается вне транзакции запроса и может разойтись со страницей
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(func.count()).select_from(UserModel)
+            )
+            return result.scalar()
@@ -1,24 +1,30 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Response, status, Request, HTTPException
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.auth import AuthService, ImpAuthService
-from repositories import UserRepository
-from dependencies import get_user_repository
-from dependencies import get_current_user, get_current_active_user
+from repositories import ImpUserRepository
+from dependencies import get_async_session
+from dependencies import get_current_user, require_user
 from schemas.auth import LoginSchema, TokenResponse, RefreshTokenSchema, TokenPayload
 from schemas import UserResponseSchemas
 from models import UserModel
+from utils.cookies import get_cookie
+from settings import Settings, get_settings
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Заголовки 401 ответа (исключение создаётся заново при каждом raise)
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+
 
 def get_auth_service(
-    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> AuthService:
     """Dependency для получения сервиса аутентификации"""
-    return ImpAuthService(repository)
+    return ImpAuthService(ImpUserRepository(session))
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -26,6 +32,7 @@ async def login(
     credentials: LoginSchema,
     response: Response,
     service: Annotated[AuthService, Depends(get_auth_service)],
+    settings: Annotated[Settings, Depends(get_settings)],
 ) -> TokenResponse:
     """
     Войти в систему
@@ -41,7 +48,7 @@ async def login(
         httponly=True,
         secure=True,  # Только для HTTPS в production
         samesite="lax",
-        max_age=15 * 60,  # 15 минут
+        max_age=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
     )
 
     response.set_cookie(
@@ -50,7 +57,7 @@ async def login(
         httponly=True,
         secure=True,  # Только для HTTPS в production
         samesite="lax",
-        max_age=7 * 24 * 60 * 60,  # 7 дней
+        max_age=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
     )
 
     return tokens
@@ -61,18 +68,19 @@ async def refresh_token(
     request: Request,
     response: Response,
     service: Annotated[AuthService, Depends(get_auth_service)],
+    settings: Annotated[Settings, Depends(get_settings)],
 ) -> TokenResponse:
     """
     Обновить токены используя refresh токен из cookies
     """
     # Получаем refresh токен из cookies
-    refresh_token = request.cookies.get("refresh_token")
+    refresh_token = get_cookie(request, "refresh_token")
 
     if not refresh_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token not found",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=_BEARER_HEADERS,
         )
 
     # Обновляем токены
@@ -85,7 +93,7 @@ async def refresh_token(
         httponly=True,
         secure=True,
         samesite="lax",
-        max_age=15 * 60,
+        max_age=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
     )
 
     response.set_cookie(
@@ -94,7 +102,7 @@ async def refresh_token(
         httponly=True,
         secure=True,
         samesite="lax",
-        max_age=7 * 24 * 60 * 60,
+        max_age=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
     )
 
     return tokens
@@ -115,7 +123,7 @@ async def logout(response: Response) -> dict:
 
 @router.get("/me", response_model=UserResponseSchemas)
 async def get_me(
-    current_user: Annotated[UserModel, Depends(get_current_active_user)],
+    current_user: Annotated[UserModel, Depends(require_user())],
 ) -> UserResponseSchemas:
     """
     Получить информацию о текущем пользователе
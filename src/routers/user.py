@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from typing import Annotated, List
 from uuid import UUID
 
 from models import UserModel
 from services import UserService
-from dependencies import get_user_service, get_current_user
-from schemas import UserCreateSchemas, UserUpdateSchemas, UserResponseSchemas
+from dependencies import get_user_service, get_current_user, require_user
+from schemas import (
+    UserCreateSchemas,
+    UserUpdateSchemas,
+    UserResponseSchemas,
+    UserListResponseSchemas,
+    USER_LIST_ADAPTER,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -21,6 +27,30 @@ async def create_user(
     return await service.create_user(user_data)
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=List[UserResponseSchemas],
+)
+async def create_users(
+    users_data: List[UserCreateSchemas],
+    service: Annotated[UserService, Depends(get_user_service)],
+    current_user: Annotated[UserModel, Depends(require_user(admin=True))],
+) -> Response:
+    """
+    Создать нескольких пользователей одним запросом
+
+    Только для администраторов: каждый пароль хешируется argon2id,
+    поэтому анонимный пакетный запрос был бы дешёвой атакой на CPU и память
+    """
+    users = await service.create_users(users_data)
+    return Response(
+        content=USER_LIST_ADAPTER.dump_json(users),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
+
+
 # Статические маршруты ПЕРЕД динамическими
 @router.get("/list", response_model=List[UserResponseSchemas])
 async def list_users(
@@ -28,9 +58,25 @@ async def list_users(
     current_user: Annotated[UserModel, Depends(get_current_user)],
     skip: int = 0,
     limit: int = 100,
-) -> List[UserResponseSchemas]:
+) -> Response:
     """Получить список пользователей"""
-    return await service.list_users(skip=skip, limit=limit)
+    users = await service.list_users(skip=skip, limit=limit)
+    # Сериализуем список одним вызовом, минуя повторную валидацию FastAPI
+    return Response(
+        content=USER_LIST_ADAPTER.dump_json(users),
+        media_type="application/json",
+    )
+
+
+@router.get("/page", response_model=UserListResponseSchemas)
+async def list_users_page(
+    service: Annotated[UserService, Depends(get_user_service)],
+    current_user: Annotated[UserModel, Depends(get_current_user)],
+    skip: int = 0,
+    limit: int = 100,
+) -> UserListResponseSchemas:
+    """Получить страницу пользователей с общим количеством"""
+    return await service.list_users_page(skip=skip, limit=limit)
 
 
 @router.get("/active", response_model=List[UserResponseSchemas])
@@ -38,9 +84,13 @@ async def list_active_users(
     service: Annotated[UserService, Depends(get_user_service)],
     skip: int = 0,
     limit: int = 100,
-) -> List[UserResponseSchemas]:
+) -> Response:
     """Получить список активных пользователей"""
-    return await service.get_active_users(skip=skip, limit=limit)
+    users = await service.get_active_users(skip=skip, limit=limit)
+    return Response(
+        content=USER_LIST_ADAPTER.dump_json(users),
+        media_type="application/json",
+    )
 
 
 # Динамический маршрут {user_id} ПОСЛЕ всех статических
@@ -5,6 +5,7 @@ from .user import (
     UserBase,
     UserListResponseSchemas,
     UserInDBSchemas,
+    USER_LIST_ADAPTER,
 )
 
 __all__ = (
@@ -14,4 +15,5 @@ __all__ = (
     "UserBase",
     "UserListResponseSchemas",
     "UserInDBSchemas",
+    "USER_LIST_ADAPTER",
 )
@@ -1,17 +1,27 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
+
+from .types import FastEmail
+
+
+# Примеры для OpenAPI - общие константы модуля, а не литералы в каждой схеме
+_LOGIN_EXAMPLE = {"email": "user@example.com", "password": "SecurePass123!"}
+
+_TOKEN_RESPONSE_EXAMPLE = {
+    "access_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
+    "refresh_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
+    "token_type": "bearer",
+}
+
+_TOKEN_PAYLOAD_EXAMPLE = {"user_id": 1, "email": "user@example.com"}
 
 
 class LoginSchema(BaseModel):
     """Схема для входа"""
 
-    email: EmailStr = Field(description="Email пользователя")
+    email: FastEmail = Field(description="Email пользователя")
     password: str = Field(min_length=8, max_length=128, description="Пароль")
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {"email": "user@example.com", "password": "SecurePass123!"}
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": _LOGIN_EXAMPLE})
 
 
 class TokenResponse(BaseModel):
@@ -21,15 +31,7 @@ class TokenResponse(BaseModel):
     refresh_token: str = Field(description="Refresh токен")
     token_type: str = Field(default="bearer", description="Тип токена")
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "access_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-                "refresh_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-                "token_type": "bearer",
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": _TOKEN_RESPONSE_EXAMPLE})
 
 
 class RefreshTokenSchema(BaseModel):
@@ -44,6 +46,4 @@ class TokenPayload(BaseModel):
     user_id: int = Field(description="ID пользователя")
     email: str = Field(description="Email пользователя")
 
-    model_config = ConfigDict(
-        json_schema_extra={"example": {"user_id": 1, "email": "user@example.com"}}
-    )
+    model_config = ConfigDict(json_schema_extra={"example": _TOKEN_PAYLOAD_EXAMPLE})
@@ -0,0 +1,42 @@
+import re
+from typing import Any
+
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+
+
+# Без вложенных квантификаторов: сопоставление линейно по длине строки
+_EMAIL_RE = re.compile(r"[^@\s]{1,64}@[^@\s]{1,189}")
+
+
+class FastEmail(str):
+    """
+    Email с лёгкой проверкой формата вместо EmailStr
+
+    Проверяет длину (не более 254 символов) и наличие локальной части
+    и домена, домен приводится к нижнему регистру (как в EmailStr).
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_after_validator_function(
+            cls._validate, core_schema.str_schema(max_length=254)
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        json_schema = handler(schema)
+        json_schema["format"] = "email"
+        return json_schema
+
+    @staticmethod
+    def _validate(value: str) -> str:
+        if not _EMAIL_RE.fullmatch(value):
+            raise ValueError("value is not a valid email address")
+        local, domain = value.split("@")
+        return f"{local}@{domain.lower()}"
@@ -1,21 +1,70 @@
-from pydantic import BaseModel, EmailStr, UUID4, Field, ConfigDict
-from typing import Optional
+from pydantic import (
+    BaseModel,
+    UUID4,
+    Field,
+    ConfigDict,
+    StringConstraints,
+    TypeAdapter,
+)
+from typing import Annotated, Optional
 from datetime import datetime
 
+from .types import FastEmail
+
+
+# Общий тип телефона: ограничения объявлены один раз для всех схем
+_Phone = Annotated[
+    str, StringConstraints(min_length=6, max_length=12, pattern=r"^\+?[0-9]{6,12}$")
+]
+
+
+# Примеры для OpenAPI - общие константы модуля, а не литералы в каждой схеме
+_USER_CREATE_EXAMPLE = {
+    "email": "user@example.com",
+    "user_name": "johndoe",
+    "first_name": "John",
+    "last_name": "Doe",
+    "phone": "+79991234567",
+    "password": "SecurePass123!",
+}
+
+_USER_UPDATE_EXAMPLE = {
+    "first_name": "Jane",
+    "last_name": "Smith",
+    "phone": "+79991234568",
+}
+
+_USER_RESPONSE_EXAMPLE = {
+    "id": 1,
+    "uuid": "123e4567-e89b-12d3-a456-426614174000",
+    "email": "user@example.com",
+    "user_name": "johndoe",
+    "name": "John Doe",
+    "first_name": "John",
+    "last_name": "Doe",
+    "phone": "+79991234567",
+    "is_active": True,
+    "is_admin": False,
+    "created_at": "2025-11-06T14:13:00",
+    "updated_at": "2025-11-06T14:13:00",
+}
+
+_USER_LIST_EXAMPLE = {
+    "total": 100,
+    "items": [{**_USER_RESPONSE_EXAMPLE, "updated_at": None}],
+    "skip": 0,
+    "limit": 100,
+}
+
 
 class UserBase(BaseModel):
     """Базовая схема с общими полями"""
 
-    email: EmailStr
+    email: FastEmail
     user_name: str = Field(min_length=3, max_length=50, description="Username")
     first_name: str = Field(min_length=2, max_length=50, description="First name")
     last_name: str = Field(min_length=2, max_length=50, description="Last name")
-    phone: str = Field(
-        min_length=6,
-        max_length=12,
-        pattern=r"^\+?[0-9]{6,12}$",
-        description="Phone number",
-    )
+    phone: _Phone = Field(description="Phone number")
 
 
 class UserCreateSchemas(UserBase):
@@ -23,43 +72,22 @@ class UserCreateSchemas(UserBase):
 
     password: str = Field(min_length=8, max_length=128, description="User password")
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "email": "user@example.com",
-                "user_name": "johndoe",
-                "first_name": "John",
-                "last_name": "Doe",
-                "phone": "+79991234567",
-                "password": "SecurePass123!",
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": _USER_CREATE_EXAMPLE})
 
 
 class UserUpdateSchemas(BaseModel):
     """Схема для обновления пользователя (все поля опциональны)"""
 
-    email: Optional[EmailStr] = None
+    email: Optional[FastEmail] = None
     name: Optional[str] = Field(None, min_length=2, max_length=100)  # Добавлено
     user_name: Optional[str] = Field(None, min_length=3, max_length=50)
     first_name: Optional[str] = Field(None, min_length=2, max_length=50)
     last_name: Optional[str] = Field(None, min_length=2, max_length=50)
-    phone: Optional[str] = Field(
-        None, min_length=6, max_length=12, pattern=r"^\+?[0-9]{6,12}$"
-    )
+    phone: Optional[_Phone] = None
     password: Optional[str] = Field(None, min_length=8, max_length=128)
     is_active: Optional[bool] = None
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "first_name": "Jane",
-                "last_name": "Smith",
-                "phone": "+79991234568",
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": _USER_UPDATE_EXAMPLE})
 
 
 class UserResponseSchemas(UserBase):
@@ -74,26 +102,14 @@ class UserResponseSchemas(UserBase):
     updated_at: Optional[datetime] = Field(None, description="Last update date")
 
     model_config = ConfigDict(
-        from_attributes=True,
-        json_schema_extra={
-            "example": {
-                "id": 1,
-                "uuid": "123e4567-e89b-12d3-a456-426614174000",
-                "email": "user@example.com",
-                "user_name": "johndoe",
-                "name": "John Doe",
-                "first_name": "John",
-                "last_name": "Doe",
-                "phone": "+79991234567",
-                "is_active": True,
-                "is_admin": False,
-                "created_at": "2025-11-06T14:13:00",
-                "updated_at": "2025-11-06T14:13:00",
-            }
-        },
+        from_attributes=True, json_schema_extra={"example": _USER_RESPONSE_EXAMPLE}
     )
 
 
+# Предкомпилированный адаптер: одна сериализация на весь список
+USER_LIST_ADAPTER = TypeAdapter(list[UserResponseSchemas])
+
+
 class UserListResponseSchemas(BaseModel):
     """Схема для списка пользователей с пагинацией"""
 
@@ -102,31 +118,7 @@ class UserListResponseSchemas(BaseModel):
     skip: int = Field(ge=0, description="Number of skipped records")
     limit: int = Field(ge=1, le=1000, description="Number of records per page")
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "total": 100,
-                "items": [
-                    {
-                        "id": 1,
-                        "uuid": "123e4567-e89b-12d3-a456-426614174000",
-                        "email": "user@example.com",
-                        "user_name": "johndoe",
-                        "name": "John Doe",
-                        "first_name": "John",
-                        "last_name": "Doe",
-                        "phone": "+79991234567",
-                        "is_active": True,
-                        "is_admin": False,
-                        "created_at": "2025-11-06T14:13:00",
-                        "updated_at": None,
-                    }
-                ],
-                "skip": 0,
-                "limit": 100,
-            }
-        }
-    )
+    model_config = ConfigDict(json_schema_extra={"example": _USER_LIST_EXAMPLE})
 
 
 class UserInDBSchemas(UserResponseSchemas):
@@ -3,8 +3,12 @@ from fastapi import HTTPException, status
 
 from repositories import UserRepository
 from schemas.auth import LoginSchema, TokenResponse
-from utils.security import verify_password
-from utils.jwt import create_access_token, create_refresh_token, verify_token
+from utils.security import (
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from utils.jwt import create_token_pair, verify_token
 from models import UserModel
 
 
@@ -50,7 +54,9 @@ class ImpAuthService:
             )
 
         # Проверяем пароль
-        if not verify_password(credentials.password, user.hashed_password):
+        if not await verify_password_async(
+            credentials.password, user.hashed_password
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -63,9 +69,15 @@ class ImpAuthService:
                 status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
             )
 
+        # Пересчитываем устаревший хеш, пока известен пароль в открытом виде
+        if password_needs_rehash(user.hashed_password):
+            await self.repository.update(
+                user.uuid,
+                hashed_password=await hash_password_async(credentials.password),
+            )
+
         # Создаем токены
-        access_token = create_access_token(user.id, user.email)
-        refresh_token = create_refresh_token(user.id, user.email)
+        access_token, refresh_token = create_token_pair(user.id, user.email)
 
         return TokenResponse(
             access_token=access_token, refresh_token=refresh_token, token_type="bearer"
@@ -111,8 +123,7 @@ class ImpAuthService:
             )
 
         # Создаем новые токены
-        new_access_token = create_access_token(user.id, user.email)
-        new_refresh_token = create_refresh_token(user.id, user.email)
+        new_access_token, new_refresh_token = create_token_pair(user.id, user.email)
 
         return TokenResponse(
             access_token=new_access_token,
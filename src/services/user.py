@@ -1,7 +1,10 @@
+import asyncio
 from typing import Protocol, Optional, List
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 
 from repositories import UserRepository
 
@@ -9,9 +12,27 @@ from schemas import (
     UserCreateSchemas,
     UserResponseSchemas,
     UserUpdateSchemas,
+    UserListResponseSchemas,
 )
 from models import UserModel
-from utils.security import hash_password
+from utils.security import hash_password_async
+
+
+def _to_response(user: UserModel) -> UserResponseSchemas:
+    """
+    Собрать схему ответа из пользователя, прочитанного из БД, без валидации
+
+    Данные в БД уже прошли валидацию при записи, поэтому повторная проверка
+    (email, pattern телефона, длины строк) не нужна
+    """
+    return UserResponseSchemas.model_construct(
+        **{field: getattr(user, field) for field in UserResponseSchemas.model_fields}
+    )
+
+
+def _rows_to_response(rows: List[Row]) -> List[UserResponseSchemas]:
+    """Собрать схемы ответа из Core-строк (list_light) без валидации"""
+    return [UserResponseSchemas.model_construct(**row._mapping) for row in rows]
 
 
 class UserService(Protocol):
@@ -21,6 +42,12 @@ class UserService(Protocol):
         """Создать нового пользователя с валидацией"""
         ...
 
+    async def create_users(
+        self, users_data: List[UserCreateSchemas]
+    ) -> List[UserResponseSchemas]:
+        """Создать нескольких пользователей одним INSERT"""
+        ...
+
     async def get_user(self, user_uuid: UUID) -> UserResponseSchemas:
         """Получить пользователя по ID"""
         ...
@@ -35,6 +62,12 @@ class UserService(Protocol):
         """Получить список пользователей с пагинацией"""
         ...
 
+    async def list_users_page(
+        self, skip: int = 0, limit: int = 100
+    ) -> UserListResponseSchemas:
+        """Получить страницу пользователей вместе с общим количеством"""
+        ...
+
     async def update_user(
         self, user_uuid: UUID, user_data: UserUpdateSchemas
     ) -> UserResponseSchemas:
@@ -68,16 +101,63 @@ class ImpUserService:
 
     async def create_user(self, user_data: UserCreateSchemas) -> UserResponseSchemas:
         """Создать нового пользователя с валидацией"""
+        # Пароль хешируется до вставки: без предварительного SELECT занятость
+        # email выясняется только по ON CONFLICT, поэтому повторная регистрация
+        # тоже платит за argon2. Зато успешная регистрация - один запрос к БД
+        user = await self._prepare_user(user_data)
+
+        # INSERT ... ON CONFLICT (email) DO NOTHING: пустой RETURNING - email занят
+        try:
+            created_user = await self.repository.create(user)
+        except IntegrityError:
+            # Конфликт по user_name или phone ON CONFLICT (email) не перехватывает
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User with this user name or phone already exists",
+            )
 
-        # Проверка уникальности email
-        existing_user = await self.repository.get_by_email(user_data.email)
-
-        if existing_user:
+        if created_user is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this email already exists",
             )
 
+        return _to_response(created_user)
+
+    async def create_users(
+        self, users_data: List[UserCreateSchemas]
+    ) -> List[UserResponseSchemas]:
+        """Создать нескольких пользователей одним INSERT"""
+        if len(users_data) < 1 or len(users_data) > 100:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Batch size must be between 1 and 100",
+            )
+
+        emails = [user_data.email for user_data in users_data]
+        if len(set(emails)) != len(emails):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duplicate emails in batch",
+            )
+
+        # Пароли хешируются параллельно в пуле потоков
+        users = await asyncio.gather(
+            *(self._prepare_user(user_data) for user_data in users_data)
+        )
+        try:
+            created_users = await self.repository.create_many(users)
+        except IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User with this email, user name or phone already exists",
+            )
+
+        return [_to_response(user) for user in created_users]
+
+    @staticmethod
+    async def _prepare_user(user_data: UserCreateSchemas) -> dict:
+        """Проверить бизнес-правила и подготовить поля модели пользователя"""
         # Валидация бизнес-правил
         if len(user_data.email.split("@")[0]) < 3:
             raise HTTPException(
@@ -93,13 +173,11 @@ class ImpUserService:
             user_dict["name"] = f"{user_dict['first_name']} {user_dict['last_name']}"
 
         if "password" in user_dict:
-            user_dict["hashed_password"] = hash_password(user_dict.pop("password"))
-
-        # Создание пользователя
-        user = UserModel(**user_dict)
-        created_user = await self.repository.create(user)
+            user_dict["hashed_password"] = await hash_password_async(
+                user_dict.pop("password")
+            )
 
-        return UserResponseSchemas.model_validate(created_user)
+        return user_dict
 
     async def get_user(self, user_uuid: UUID) -> UserResponseSchemas:
         """Получить пользователя по ID"""
@@ -109,20 +187,43 @@ class ImpUserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with id {user_uuid} not found",
             )
-        return UserResponseSchemas.model_validate(user)
+        return _to_response(user)
 
     async def get_user_by_email(self, email: str) -> Optional[UserResponseSchemas]:
         """Найти пользователя по email"""
         user = await self.repository.get_by_email(email)
         if user:
-            return UserResponseSchemas.model_validate(user)
+            return _to_response(user)
         return None
 
     async def list_users(
         self, skip: int = 0, limit: int = 100
     ) -> List[UserResponseSchemas]:
         """Получить список пользователей с пагинацией"""
-        # Валидация параметров пагинации
+        self._check_page(skip, limit)
+
+        users = await self.repository.list_light(skip=skip, limit=limit)
+        return _rows_to_response(users)
+
+    async def list_users_page(
+        self, skip: int = 0, limit: int = 100
+    ) -> UserListResponseSchemas:
+        """Получить страницу пользователей вместе с общим количеством"""
+        self._check_page(skip, limit)
+
+        # COUNT(*) идёт в отдельной сессии, поэтому запросы выполняются
+        # параллельно: время ответа - max, а не сумма двух запросов
+        total, users = await asyncio.gather(
+            self.repository.count(),
+            self.repository.list_light(skip=skip, limit=limit),
+        )
+        return UserListResponseSchemas.model_construct(
+            total=total, items=_rows_to_response(users), skip=skip, limit=limit
+        )
+
+    @staticmethod
+    def _check_page(skip: int, limit: int) -> None:
+        """Проверить параметры пагинации"""
         if skip < 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -134,26 +235,15 @@ class ImpUserService:
                 detail="Limit must be between 1 and 1000",
             )
 
-        users = await self.repository.get_all(skip=skip, limit=limit)
-        return [UserResponseSchemas.model_validate(user) for user in users]
-
     async def update_user(
         self, user_uuid: UUID, user_data: UserUpdateSchemas
     ) -> UserResponseSchemas:
         """Обновить данные пользователя"""
-        # Проверка существования
-        existing_user = await self.repository.get_by_uuid(user_uuid)
-        if not existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with id {user_uuid} not found",
-            )
-
         # Если обновляется email, проверяем уникальность
         update_dict = user_data.model_dump(exclude_unset=True)
         if "email" in update_dict:
             email_user = await self.repository.get_by_email(update_dict["email"])
-            if email_user and email_user.id != user_uuid:
+            if email_user and email_user.uuid != user_uuid:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email already in use",
@@ -161,76 +251,70 @@ class ImpUserService:
 
         # Если обновляется пароль, хешируем его
         if "password" in update_dict:
-            update_dict["hashed_password"] = hash_password(update_dict.pop("password"))
+            update_dict["hashed_password"] = await hash_password_async(
+                update_dict.pop("password")
+            )
 
+        # UPDATE ... RETURNING: отсутствие строки означает, что пользователя нет
         updated_user = await self.repository.update(user_uuid, **update_dict)
-        return UserResponseSchemas.model_validate(updated_user)
-
-    async def delete_user(self, user_uuid: UUID) -> bool:
-        """Удалить пользователя"""
-        # Проверка существования
-        user = await self.repository.get_by_uuid(user_uuid)
-        if not user:
+        if updated_user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with id {user_uuid} not found",
             )
+        return _to_response(updated_user)
+
+    async def delete_user(self, user_uuid: UUID) -> bool:
+        """Удалить пользователя"""
+        # Бизнес-правило: нельзя удалить активного админа (проверяется в DELETE)
+        if await self.repository.delete(user_uuid, keep_active_admin=True):
+            return True
 
-        # Бизнес-правило: нельзя удалить активного админа
-        if (
-            hasattr(user, "is_admin")
-            and user.is_admin
-            and hasattr(user, "is_active")
-            and user.is_active
-        ):
+        # Строка не удалена - выясняем причину (только на неуспешном пути)
+        if await self.repository.exists(user_uuid):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Cannot delete active admin user",
             )
-
-        return await self.repository.delete(user_uuid)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_uuid} not found",
+        )
 
     async def activate_user(self, user_uuid: UUID) -> UserResponseSchemas:
         """Активировать пользователя"""
-        user = await self.repository.get_by_uuid(user_uuid)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with id {user_uuid} not found",
-            )
-
-        if hasattr(user, "is_active") and user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="User is already active"
-            )
-
-        updated_user = await self.repository.update(user_uuid, is_active=True)
-        return UserResponseSchemas.model_validate(updated_user)
+        return await self._set_active(user_uuid, True)
 
     async def deactivate_user(self, user_uuid: UUID) -> UserResponseSchemas:
         """Деактивировать пользователя"""
-        user = await self.repository.get_by_uuid(user_uuid)
-        if not user:
+        return await self._set_active(user_uuid, False)
+
+    async def _set_active(
+        self, user_uuid: UUID, is_active: bool
+    ) -> UserResponseSchemas:
+        """Сменить статус активности одним UPDATE ... WHERE is_active != $2"""
+        updated_user = await self.repository.set_active(user_uuid, is_active)
+        if updated_user is not None:
+            return _to_response(updated_user)
+
+        # Строка не обновлена - выясняем причину (только на неуспешном пути)
+        if not await self.repository.exists(user_uuid):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with id {user_uuid} not found",
             )
-
-        if hasattr(user, "is_active") and not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User is already inactive",
-            )
-
-        updated_user = await self.repository.update(user_uuid, is_active=False)
-        return UserResponseSchemas.model_validate(updated_user)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "User is already active" if is_active else "User is already inactive"
+            ),
+        )
 
     async def get_active_users(
         self, skip: int = 0, limit: int = 100
     ) -> List[UserResponseSchemas]:
         """Получить список активных пользователей"""
-        all_users = await self.repository.get_all(skip=skip, limit=limit)
-        active_users = [
-            user for user in all_users if hasattr(user, "is_active") and user.is_active
-        ]
-        return [UserResponseSchemas.model_validate(user) for user in active_users]
+        active_users = await self.repository.list_light(
+            skip=skip, limit=limit, is_active=True
+        )
+        return _rows_to_response(active_users)
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Union, List
 
@@ -11,6 +14,12 @@ class Settings(BaseSettings):
     DB_USER: str = "myuser"
     DB_PASS: str = "mypassword"
     DB_NAME: str = "mydatabase"
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
 
     # JWT Settings
     JWT_SECRET_KEY: str = "your-super-secret-key-change-in-production"
@@ -18,6 +27,11 @@ class Settings(BaseSettings):
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing (argon2id)
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 19456
+    ARGON2_PARALLELISM: int = 1
+
     # App settings
     app_name: str = "FastAPI JWT Auth"
     debug: bool = True
@@ -30,6 +44,14 @@ class Settings(BaseSettings):
         "http://127.0.0.1:3000",
     ]
 
+    @field_validator("cors_origins")
+    @classmethod
+    def split_cors_origins(cls, value: Union[List[str], str]) -> List[str]:
+        """Разбить строку origins из .env (через запятую) в список"""
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
+
     @property
     def database_url_asyncpg(self) -> str:
         """URL для PostgreSQL базы данных"""
@@ -40,4 +62,10 @@ class Settings(BaseSettings):
     )
 
 
-config = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Получить настройки проекта (.env читается один раз за процесс)"""
+    return Settings()
+
+
+config = get_settings()
@@ -0,0 +1,58 @@
+# src/utils/cache.py
+"""
+Простой in-process TTL-кэш с ограничением размера (LRU)
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    LRU-кэш, записи которого устаревают через ttl секунд
+
+    Работает в рамках одного event loop, поэтому блокировки не нужны:
+    все операции синхронные и не прерываются другими корутинами.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Получить значение или None, если его нет или оно устарело"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохранить значение, вытеснив самую старую запись при переполнении"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удалить значение из кэша"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистить кэш"""
+        self._data.clear()
+
+
+# Кэш пользователей для get_current_user (ключ - ID пользователя).
+# Кэш свой в каждом процессе: pop в репозитории очищает запись только
+# в текущем воркере, поэтому на остальных деактивированный, удалённый
+# или лишённый прав пользователь остаётся авторизованным до истечения ttl.
+# Отсюда короткий ttl - это верхняя граница такой задержки
+user_cache = TTLCache(maxsize=10_000, ttl=10)
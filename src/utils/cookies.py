@@ -0,0 +1,46 @@
+# src/utils/cookies.py
+"""
+Быстрое чтение cookies из сырых заголовков запроса без разбора всего Cookie
+"""
+from typing import Optional
+
+from fastapi import Request
+
+
+def parse_cookie(header: bytes, name: bytes) -> Optional[bytes]:
+    """
+    Найти значение cookie в сыром заголовке Cookie
+
+    Args:
+        header: Значение заголовка Cookie
+        name: Имя cookie
+
+    Returns:
+        bytes со значением cookie или None если её нет
+    """
+    prefix = name + b"="
+    for chunk in header.split(b";"):
+        chunk = chunk.strip()
+        if chunk.startswith(prefix):
+            return chunk[len(prefix) :]
+    return None
+
+
+def get_cookie(request: Request, name: str) -> Optional[str]:
+    """
+    Получить cookie из запроса, не материализуя request.cookies
+
+    Args:
+        request: FastAPI request
+        name: Имя cookie
+
+    Returns:
+        str со значением cookie или None если её нет
+    """
+    encoded_name = name.encode("latin-1")
+    for key, value in request.scope["headers"]:
+        if key == b"cookie":
+            cookie = parse_cookie(value, encoded_name)
+            if cookie is not None:
+                return cookie.decode("latin-1")
+    return None
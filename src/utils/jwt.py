@@ -1,56 +1,165 @@
-from datetime import datetime, timedelta
+import asyncio
+import base64
+import hashlib
+import hmac
+import time
 from typing import Optional
 import jwt
-from jwt.exceptions import InvalidTokenError
+import orjson
+from jwt.exceptions import (
+    DecodeError,
+    ExpiredSignatureError,
+    InvalidSignatureError,
+    InvalidTokenError,
+    MissingRequiredClaimError,
+)
 from pydantic import BaseModel
 
 from settings import config
+from utils.cache import TTLCache
 
 
-class TokenData(BaseModel):
-    """Данные из токена"""
+# Хеш-функции для HMAC-алгоритмов, которые подписываются без PyJWT
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+# Настройки подписи читаются из config один раз при импорте
+_JWT = jwt.PyJWT()
+_SECRET_KEY = config.JWT_SECRET_KEY
+_SIGNING_KEY = _SECRET_KEY.encode()
+_ALGORITHM = config.JWT_ALGORITHM
+_ALGORITHMS = [_ALGORITHM]
+_HMAC_DIGEST = _HMAC_DIGESTS.get(_ALGORITHM)
+
+# Время жизни токенов в секундах
+_ACCESS_TTL = config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TTL = config.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+
+def _b64encode(data: bytes) -> bytes:
+    """base64url без padding, как требует JWT"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
 
-    user_id: int
-    email: str
-    exp: datetime
 
+def _b64decode(data: bytes) -> bytes:
+    """Обратное к _b64encode: восстанавливает padding и декодирует"""
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
 
-def create_access_token(user_id: int, email: str) -> str:
+
+# Заголовок одинаковый для всех токенов - кодируем его один раз
+_HEADER_B64 = _b64encode(orjson.dumps({"alg": _ALGORITHM, "typ": "JWT"}))
+
+
+def _sign_payload(payload: dict) -> str:
     """
-    Создать access токен
+    Подписать payload и собрать JWT
+
+    Для HS* подпись считается напрямую через hmac (OpenSSL) и orjson,
+    остальные алгоритмы подписываются PyJWT.
 
     Args:
-        user_id: ID пользователя
-        email: Email пользователя
+        payload: Данные токена (exp - unix timestamp)
 
     Returns:
         str: JWT токен
     """
-    expire = datetime.utcnow() + timedelta(
-        minutes=config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
-    )
+    if _HMAC_DIGEST is None:
+        return _JWT.encode(payload, _SECRET_KEY, algorithm=_ALGORITHM)
 
-    payload = {"user_id": user_id, "email": email, "exp": expire, "type": "access"}
+    signing_input = _HEADER_B64 + b"." + _b64encode(orjson.dumps(payload))
+    signature = hmac.new(_SIGNING_KEY, signing_input, _HMAC_DIGEST).digest()
+    return (signing_input + b"." + _b64encode(signature)).decode()
 
-    return jwt.encode(payload, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
 
+def _decode_payload(token: str) -> dict:
+    """
+    Проверить подпись и срок действия токена и вернуть его payload
 
-def create_refresh_token(user_id: int, email: str) -> str:
+    Для HS* подпись проверяется напрямую через hmac, остальные алгоритмы
+    проверяет PyJWT. Подписи сравниваются только через hmac.compare_digest
+    (за постоянное время) - обычное == для секретов здесь не используется.
+
+    Args:
+        token: JWT токен
+
+    Returns:
+        dict: Payload токена
+
+    Raises:
+        InvalidTokenError: Токен повреждён, подпись не совпала или срок истёк
     """
-    Создать refresh токен
+    if _HMAC_DIGEST is None:
+        return _JWT.decode(
+            token, _SECRET_KEY, algorithms=_ALGORITHMS, options={"require": ["exp"]}
+        )
+
+    try:
+        signing_input, signature_b64 = token.encode("ascii").rsplit(b".", 1)
+        header_b64, payload_b64 = signing_input.split(b".")
+        signature = _b64decode(signature_b64)
+    except (UnicodeEncodeError, ValueError) as exc:
+        raise DecodeError("Invalid token segments") from exc
+
+    # Заголовок у всех наших токенов один и тот же - другой алгоритм не принимаем
+    if not hmac.compare_digest(header_b64, _HEADER_B64):
+        raise DecodeError("Invalid token header")
+
+    expected = hmac.new(_SIGNING_KEY, signing_input, _HMAC_DIGEST).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidSignatureError("Signature verification failed")
+
+    try:
+        payload = orjson.loads(_b64decode(payload_b64))
+    except ValueError as exc:
+        raise DecodeError("Invalid payload") from exc
+    if not isinstance(payload, dict):
+        raise DecodeError("Invalid payload")
+
+    exp = payload.get("exp")
+    if exp is None:
+        raise MissingRequiredClaimError("exp")
+    if not isinstance(exp, (int, float)) or isinstance(exp, bool):
+        raise DecodeError("Expiration Time claim (exp) must be an integer.")
+    if exp <= time.time():
+        raise ExpiredSignatureError("Signature has expired")
+
+    return payload
+
+
+# Кэш уже проверенных токенов (ключ - сам токен и его тип)
+_verified_tokens = TTLCache(maxsize=10_000, ttl=60)
+
+
+class TokenData(BaseModel):
+    """Данные из токена"""
+
+    user_id: int
+    email: str
+    exp: int  # unix timestamp
+
+
+def create_token_pair(user_id: int, email: str) -> tuple[str, str]:
+    """
+    Создать access и refresh токены за один вызов
 
     Args:
         user_id: ID пользователя
         email: Email пользователя
 
     Returns:
-        str: JWT токен
+        tuple[str, str]: Access и refresh токены
     """
-    expire = datetime.utcnow() + timedelta(days=config.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
-
-    payload = {"user_id": user_id, "email": email, "exp": expire, "type": "refresh"}
+    now = int(time.time())
+    base = {"user_id": user_id, "email": email}
 
-    return jwt.encode(payload, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    access_token = _sign_payload({**base, "exp": now + _ACCESS_TTL, "type": "access"})
+    refresh_token = _sign_payload(
+        {**base, "exp": now + _REFRESH_TTL, "type": "refresh"}
+    )
+    return access_token, refresh_token
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
@@ -65,9 +174,7 @@ def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
         TokenData или None если токен невалидный
     """
     try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM]
-        )
+        payload = _decode_payload(token)
 
         # Проверяем тип токена
         if payload.get("type") != token_type:
@@ -76,12 +183,44 @@ def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
         return TokenData(
             user_id=payload.get("user_id"),
             email=payload.get("email"),
-            exp=datetime.fromtimestamp(payload.get("exp")),
+            exp=int(payload.get("exp")),
         )
     except InvalidTokenError:
         return None
 
 
+async def verify_token_cached(
+    token: str, token_type: str = "access"
+) -> Optional[TokenData]:
+    """
+    Проверить токен, переиспользуя результат предыдущих проверок
+
+    HMAC (HS*) проверяется прямо в event loop - это дешевле, чем переключение
+    на поток. Асимметричные алгоритмы (RS*/ES*/PS*) выполняются в пуле потоков,
+    чтобы не блокировать другие запросы.
+
+    Args:
+        token: JWT токен
+        token_type: Тип токена (access/refresh)
+
+    Returns:
+        TokenData или None если токен невалидный
+    """
+    key = (token, token_type)
+    token_data = _verified_tokens.get(key)
+    if token_data is not None and token_data.exp > time.time():
+        return token_data
+
+    if _HMAC_DIGEST is not None:
+        token_data = verify_token(token, token_type)
+    else:
+        token_data = await asyncio.to_thread(verify_token, token, token_type)
+
+    if token_data is not None:
+        _verified_tokens.set(key, token_data)
+    return token_data
+
+
 def decode_token_no_verify(token: str) -> Optional[dict]:
     """
     Декодировать токен без проверки (для отладки)
@@ -93,6 +232,6 @@ def decode_token_no_verify(token: str) -> Optional[dict]:
         dict с данными или None
     """
     try:
-        return jwt.decode(token, options={"verify_signature": False})
+        return _JWT.decode(token, options={"verify_signature": False})
     except Exception:
         return None
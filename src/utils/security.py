@@ -2,12 +2,29 @@
 """
 Утилиты для работы с безопасностью: хеширование паролей и их проверка
 """
-import bcrypt
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from settings import config
+
+
+# argon2id, по умолчанию с параметрами OWASP: m=19 MiB, t=2, p=1
+_password_hasher = PasswordHasher(
+    time_cost=config.ARGON2_TIME_COST,
+    memory_cost=config.ARGON2_MEMORY_COST,
+    parallelism=config.ARGON2_PARALLELISM,
+    hash_len=32,
+    salt_len=16,
+)
 
 
 def hash_password(password: str) -> str:
     """
-    Хеширует пароль с использованием bcrypt
+    Хеширует пароль с использованием argon2id
 
     Args:
         password: Пароль в открытом виде
@@ -15,17 +32,81 @@ def hash_password(password: str) -> str:
     Returns:
         str: Хешированный пароль
     """
-    # Ограничиваем длину пароля до 72 байт (требование bcrypt)
-    password_bytes = password.encode("utf-8")[:72]
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode("utf-8")
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Проверяет соответствие пароля его хешу
 
+    Поддерживает как argon2id, так и старые bcrypt-хеши ($2a$/$2b$/$2y$)
+
+    Args:
+        plain_password: Пароль в открытом виде
+        hashed_password: Хешированный пароль из БД
+
+    Returns:
+        bool: True если пароль совпадает, False если нет
+    """
+    if hashed_password.startswith("$2"):
+        # bcrypt нужен только для старых хешей - импортируем при первой проверке
+        import bcrypt
+
+        # Старые bcrypt-хеши: ограничение длины пароля до 72 байт.
+        # Символ занимает в UTF-8 не меньше байта, поэтому первых 72 символов
+        # достаточно - длинный пароль не кодируется целиком
+        password_bytes = plain_password[:72].encode("utf-8")[:72]
+        hashed_bytes = hashed_password.encode("utf-8")
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Проверяет, нужно ли пересчитать хеш пароля
+
+    Args:
+        hashed_password: Хешированный пароль из БД
+
+    Returns:
+        bool: True для старых bcrypt-хешей и argon2-хешей с устаревшими параметрами
+    """
+    if hashed_password.startswith("$2"):
+        return True
+    try:
+        return _password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+
+# argon2 и bcrypt отпускают GIL, поэтому хеширование в потоках идёт параллельно
+_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="password-hasher"
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Хеширует пароль в пуле потоков, не блокируя event loop
+
+    Args:
+        password: Пароль в открытом виде
+
+    Returns:
+        str: Хешированный пароль
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Проверяет пароль в пуле потоков, не блокируя event loop
+
     Args:
         plain_password: Пароль в открытом виде
         hashed_password: Хешированный пароль из БД
@@ -33,6 +114,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True если пароль совпадает, False если нет
     """
-    password_bytes = plain_password.encode("utf-8")[:72]
-    hashed_bytes = hashed_password.encode("utf-8")
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, verify_password, plain_password, hashed_password
+    )
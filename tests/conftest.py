@@ -3,21 +3,18 @@
 """
 
 import asyncio
+import sys
+
 import pytest
 
 
-# Настройка event loop для async тестов
+# Event loop общий для всей сессии тестирования: задаётся через
+# asyncio_default_fixture_loop_scope / asyncio_default_test_loop_scope в pytest.ini
 @pytest.fixture(scope="session")
-def event_loop():
-    """Создать event loop для всей сессии тестирования"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
+def event_loop_policy():
+    """Политика event loop для тестов: uvloop (кроме Windows)"""
+    if sys.platform != "win32":
+        import uvloop
 
-# Маркеры для pytest
-def pytest_configure(config):
-    """Регистрация custom маркеров"""
-    config.addinivalue_line("markers", "asyncio: mark test as async")
-    config.addinivalue_line("markers", "integration: mark test as integration test")
-    config.addinivalue_line("markers", "unit: mark test as unit test")
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
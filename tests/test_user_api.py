@@ -1,144 +1,330 @@
+import asyncpg
+import hashlib
+import itertools
+import orjson
+import os
 import pytest
-import sys
-from pathlib import Path
+from contextlib import asynccontextmanager
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy import text
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 from uuid import uuid4
 
-# Добавляем src в путь
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from main import app
-from dependencies import get_async_session
+from dependencies import get_async_session, get_async_session_factory
+from models import UserModel
 from models.base import BaseModelSql
 from settings import config
+from utils.security import hash_password
 
 
-# Тестовая база данных
-TEST_DATABASE_URL = f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASS}@{config.DB_HOST}:{config.DB_PORT}/test_{config.DB_NAME}"
+# Базовый URL сервера PostgreSQL (без имени БД)
+POSTGRES_URL = f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASS}@{config.DB_HOST}:{config.DB_PORT}"
 
-test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
-test_session_factory = async_sessionmaker(
-    test_engine, class_=AsyncSession, expire_on_commit=False
-)
 
+# Фикстура для имени тестовой БД (своя БД на каждый воркер pytest-xdist)
+@pytest.fixture(scope="session")
+def test_db_name():
+    """Получить имя тестовой БД текущего воркера"""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    return f"test_{config.DB_NAME}_{worker}"
 
-# Фикстура для создания/удаления тестовой БД
-@pytest.fixture(scope="session", autouse=True)
-async def setup_test_database():
-    """Создать тестовую базу данных перед тестами"""
-    # Подключаемся к postgres для создания тестовой БД
+
+# Фикстура для движка тестовой БД (один на всю сессию)
+@pytest.fixture(scope="session")
+async def test_engine(test_db_name):
+    """Получить движок тестовой БД"""
+    # Без пула: тесты держат одно соединение на всю сессию
     engine = create_async_engine(
-        f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASS}@{config.DB_HOST}:{config.DB_PORT}/postgres",
-        isolation_level="AUTOCOMMIT",
+        f"{POSTGRES_URL}/{test_db_name}", poolclass=NullPool, echo=False
+    )
+    yield engine
+    await engine.dispose()
+
+
+@asynccontextmanager
+async def admin_connection():
+    """Открыть одно соединение asyncpg со служебной БД postgres для DDL"""
+    admin = await asyncpg.connect(
+        user=config.DB_USER,
+        password=config.DB_PASS,
+        host=config.DB_HOST,
+        port=config.DB_PORT,
+        database="postgres",
     )
+    try:
+        yield admin
+    finally:
+        await admin.close()
 
-    async with engine.connect() as conn:
-        # Удаляем тестовую БД если существует
-        await conn.execute(text(f"DROP DATABASE IF EXISTS test_{config.DB_NAME}"))
-        # Создаем тестовую БД
-        await conn.execute(text(f"CREATE DATABASE test_{config.DB_NAME}"))
 
-    await engine.dispose()
+def schema_fingerprint() -> str:
+    """Короткий хеш DDL схемы: шаблон пересоздаётся при изменении моделей"""
+    dialect = postgresql.dialect()
+    ddl = []
+    for table in BaseModelSql.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(
+            str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes
+        )
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()[:12]
 
-    # Создаем таблицы
-    async with test_engine.begin() as conn:
-        await conn.run_sync(BaseModelSql.metadata.create_all)
+
+# Фикстура для создания/удаления тестовой БД
+@pytest.fixture(scope="session", autouse=True)
+async def setup_test_database(test_engine, test_db_name):
+    """Создать тестовую базу данных перед тестами"""
+    template_prefix = f"test_{config.DB_NAME}_template_"
+    template_name = f"{template_prefix}{schema_fingerprint()}"
+
+    async with admin_connection() as admin:
+        # Блокировка: шаблон создаёт только один из воркеров xdist
+        await admin.execute("SELECT pg_advisory_lock(hashtext($1))", template_name)
+        try:
+            template_exists = await admin.fetchval(
+                "SELECT 1 FROM pg_database WHERE datname = $1", template_name
+            )
+            if not template_exists:
+                # Схема создаётся один раз - в шаблонной БД
+                await admin.execute(f"CREATE DATABASE {template_name}")
+                template_engine = create_async_engine(
+                    f"{POSTGRES_URL}/{template_name}", poolclass=NullPool
+                )
+                async with template_engine.begin() as conn:
+                    await conn.run_sync(BaseModelSql.metadata.create_all)
+                await template_engine.dispose()
+
+            # Шаблоны от прошлых версий схемы больше не нужны
+            stale_templates = await admin.fetch(
+                "SELECT datname FROM pg_database"
+                " WHERE starts_with(datname, $1) AND datname <> $2",
+                template_prefix,
+                template_name,
+            )
+            for record in stale_templates:
+                try:
+                    await admin.execute(f"DROP DATABASE IF EXISTS {record['datname']}")
+                except asyncpg.ObjectInUseError:
+                    # Шаблон сейчас копирует другой запуск - удалим в следующий раз
+                    pass
+
+            # Тестовая БД - поблочная копия шаблона, без повторного DDL
+            await admin.execute(f"DROP DATABASE IF EXISTS {test_db_name}")
+            await admin.execute(
+                f"CREATE DATABASE {test_db_name} TEMPLATE {template_name}"
+            )
+        finally:
+            await admin.execute(
+                "SELECT pg_advisory_unlock(hashtext($1))", template_name
+            )
 
     yield
 
     # Очистка после всех тестов
     await test_engine.dispose()
 
-    # Удаляем тестовую БД
-    engine = create_async_engine(
-        f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASS}@{config.DB_HOST}:{config.DB_PORT}/postgres",
-        isolation_level="AUTOCOMMIT",
-    )
-    async with engine.connect() as conn:
-        await conn.execute(text(f"DROP DATABASE IF EXISTS test_{config.DB_NAME}"))
-    await engine.dispose()
+    # Удаляем тестовую БД (шаблон остаётся для следующих запусков)
+    async with admin_connection() as admin:
+        await admin.execute(f"DROP DATABASE IF EXISTS {test_db_name}")
 
 
-# Фикстура для сессии БД
-@pytest.fixture
-async def db_session():
-    """Получить тестовую сессию БД"""
-    async with test_session_factory() as session:
-        yield session
-        await session.rollback()
+# Фикстура для соединения с внешней транзакцией (откатывается в конце сессии)
+@pytest.fixture(scope="session")
+async def connection(test_engine, setup_test_database):
+    """Получить соединение с открытой транзакцией на всю сессию"""
+    conn = await test_engine.connect()
+    trans = await conn.begin()
+    yield conn
+    await trans.rollback()
+    await conn.close()
 
 
-# Фикстура для переопределения зависимости
+# Фикстура для сессии БД
 @pytest.fixture
-async def override_get_db(db_session):
-    """Переопределить зависимость get_async_session"""
+async def db_session(connection):
+    """Получить тестовую сессию БД, изолированную SAVEPOINT'ом"""
+    # Всё, что тест записал в БД, откатывается вместе с SAVEPOINT,
+    # поэтому очистка таблиц (TRUNCATE) между тестами не нужна
+    savepoint = await connection.begin_nested()
+    session = AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    yield session
+    await session.close()
+    await savepoint.rollback()
 
-    async def _override_get_db():
-        yield db_session
 
-    app.dependency_overrides[get_async_session] = _override_get_db
-    yield
+# Фикстура для HTTP клиента (один транспорт и клиент на всю сессию)
+@pytest.fixture(scope="session")
+async def http_client():
+    """Получить HTTP клиент, общий для всех тестов"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
     app.dependency_overrides.clear()
 
 
-# Фикстура для HTTP клиента
+# Фикстура для HTTP клиента с сессией БД текущего теста
 @pytest.fixture
-async def client(override_get_db):
-    """Получить HTTP клиент для тестирования"""
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+def client(http_client, connection, db_session):
+    """Получить HTTP клиент, работающий с сессией БД текущего теста"""
+    # Переопределяем зависимость get_async_session на сессию теста
+    app.dependency_overrides[get_async_session] = lambda: db_session
+    # Отдельные сессии (например, для COUNT(*)) работают в той же транзакции,
+    # иначе они не увидят несохранённые данные теста
+    session_factory = async_sessionmaker(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+    http_client.cookies.clear()
+    return http_client
+
+
+async def fake_hash_password(password: str) -> str:
+    """Мгновенная замена argon2 для тестов, которым не важен настоящий хеш"""
+    return f"dummy${password}"
+
+
+# Фикстура для быстрого хеширования паролей
+@pytest.fixture(autouse=True)
+def fast_password_hashing(request, monkeypatch):
+    """Подменить хеширование паролей, кроме тестов с маркером real_hashing"""
+    if request.node.get_closest_marker("real_hashing") is None:
+        monkeypatch.setattr("services.user.hash_password_async", fake_hash_password)
+
+
+# Заголовки для запросов с телом, заранее сериализованным через orjson
+# (для тел, которые отправляются повторно)
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _json(data) -> bytes:
+    """Сериализовать тело запроса один раз (orjson вместо json.dumps в httpx)"""
+    return orjson.dumps(data)
+
+
+# Счётчик для уникальных email/username/телефонов в тестовых данных
+_counter = itertools.count()
 
 
 # Фикстура для тестовых данных пользователя
 @pytest.fixture
 def user_data():
     """Тестовые данные для создания пользователя"""
+    n = next(_counter)
     return {
-        "email": f"test_{uuid4().hex[:8]}@example.com",
-        "user_name": f"testuser_{uuid4().hex[:8]}",
+        "email": f"test_{n}@example.com",
+        "user_name": f"testuser_{n}",
         "name": "TestNme",
         "first_name": "Test",
         "last_name": "User",
-        "phone": f"+7909{uuid4().hex[:7]}",
+        "phone": f"+7909{n:07d}",
         "password": "TestPassword123!",
     }
 
 
+# Пароль пользователей из bulk_users и его хеш (вычисляется один раз)
+BULK_PASSWORD = "TestPassword123!"
+BULK_PASSWORD_HASH = hash_password(BULK_PASSWORD)
+
+
+# Фикстура для созданного через API пользователя
+@pytest.fixture
+async def created_user(client, user_data):
+    """Создать пользователя через API и вернуть его данные из ответа"""
+    response = await client.post("/api/v1/users/", json=user_data)
+    assert response.status_code == 201
+    return orjson.loads(response.content)
+
+
+# Фикстура для пользователей, записанных напрямую в БД
+@pytest.fixture
+async def bulk_users(db_session):
+    """Создать 5 пользователей одним INSERT, минуя HTTP и хеширование"""
+    # Последний пользователь неактивен - для теста списка активных
+    rows = [
+        {
+            "email": f"bulk_{n}@example.com",
+            "user_name": f"bulkuser_{n}",
+            "name": "Bulk User",
+            "first_name": "Bulk",
+            "last_name": "User",
+            "phone": f"+7909{n:07d}",
+            "hashed_password": BULK_PASSWORD_HASH,
+            "is_active": i < 4,
+        }
+        for i, n in enumerate(itertools.islice(_counter, 5))
+    ]
+    await db_session.execute(insert(UserModel), rows)
+    return rows
+
+
+# Фикстура для администратора, записанного напрямую в БД
+@pytest.fixture
+async def admin_user(db_session):
+    """Создать активного администратора с паролем BULK_PASSWORD"""
+    n = next(_counter)
+    row = {
+        "email": f"admin_{n}@example.com",
+        "user_name": f"adminuser_{n}",
+        "name": "Admin User",
+        "first_name": "Admin",
+        "last_name": "User",
+        "phone": f"+7909{n:07d}",
+        "hashed_password": BULK_PASSWORD_HASH,
+        "is_admin": True,
+    }
+    await db_session.execute(insert(UserModel), [row])
+    return row
+
+
+async def login(client, email: str) -> None:
+    """Войти под пользователем и сохранить access токен в cookies клиента"""
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": email, "password": BULK_PASSWORD}
+    )
+    assert response.status_code == 200
+    # Cookie из ответа помечены secure и не уходят на http://test
+    client.cookies.set("access_token", orjson.loads(response.content)["access_token"])
+
+
 # ============= ТЕСТЫ ROOT ЭНДПОИНТОВ =============
 
 
-@pytest.mark.asyncio
 async def test_root_endpoint(client):
     """Тест корневого эндпоинта"""
     response = await client.get("/")
     assert response.status_code == 200
-    data = response.json()
+    data = orjson.loads(response.content)
     assert data["status"] == "running"
     assert "version" in data
 
 
-@pytest.mark.asyncio
 async def test_health_check(client):
     """Тест health check эндпоинта"""
     response = await client.get("/health")
     assert response.status_code == 200
-    data = response.json()
+    data = orjson.loads(response.content)
     assert data["status"] == "healthy"
 
 
 # ============= ТЕСТЫ СОЗДАНИЯ ПОЛЬЗОВАТЕЛЯ =============
 
 
-@pytest.mark.asyncio
+@pytest.mark.real_hashing
 async def test_create_user_success(client, user_data):
     """Тест успешного создания пользователя"""
     response = await client.post("/api/v1/users/", json=user_data)
     assert response.status_code == 201
 
-    data = response.json()
+    data = orjson.loads(response.content)
     assert data["email"] == user_data["email"]
     assert data["user_name"] == user_data["user_name"]
     assert data["name"] == user_data["name"]
@@ -151,72 +337,109 @@ async def test_create_user_success(client, user_data):
     assert "hashed_password" not in data
 
 
-@pytest.mark.asyncio
 async def test_create_user_duplicate_email(client, user_data):
     """Тест создания пользователя с дублирующимся email"""
     # Создаем первого пользователя
     await client.post("/api/v1/users/", json=user_data)
 
     # Пытаемся создать второго с тем же email
-    user_data["user_name"] = f"another_{uuid4().hex[:8]}"
+    user_data["user_name"] = f"another_{next(_counter)}"
     response = await client.post("/api/v1/users/", json=user_data)
     assert response.status_code == 400
-    assert "already exists" in response.json()["detail"]
+    assert b"already exists" in response.content
 
 
-@pytest.mark.asyncio
-async def test_create_user_invalid_email(client, user_data):
-    """Тест создания пользователя с невалидным email"""
-    user_data["email"] = "invalid-email"
+async def test_create_user_duplicate_user_name(client, user_data, created_user):
+    """Тест создания пользователя с занятым user_name"""
+    n = next(_counter)
+    user_data["email"] = f"other_{n}@example.com"
+    user_data["phone"] = f"+7909{n:07d}"
     response = await client.post("/api/v1/users/", json=user_data)
-    assert response.status_code == 422
+    assert response.status_code == 400
+    assert b"already exists" in response.content
 
 
-@pytest.mark.asyncio
-async def test_create_user_short_password(client, user_data):
-    """Тест создания пользователя с коротким паролем"""
-    user_data["password"] = "123"
+@pytest.mark.parametrize(
+    "field,value",
+    [
+        ("email", "invalid-email"),  # невалидный email
+        ("password", "123"),  # короткий пароль
+        ("user_name", "ab"),  # короткий username
+    ],
+)
+async def test_create_user_invalid(client, user_data, field, value):
+    """Тест создания пользователя с невалидными данными"""
+    user_data[field] = value
     response = await client.post("/api/v1/users/", json=user_data)
     assert response.status_code == 422
 
 
-@pytest.mark.asyncio
-async def test_create_user_short_username(client, user_data):
-    """Тест создания пользователя с коротким username"""
-    user_data["user_name"] = "ab"
-    response = await client.post("/api/v1/users/", json=user_data)
-    assert response.status_code == 422
+async def test_create_users_bulk(client, user_data, admin_user):
+    """Тест пакетного создания пользователей"""
+    await login(client, admin_user["email"])
+
+    payloads = []
+    for i in range(3):
+        n = next(_counter)
+        data = user_data.copy()
+        data["email"] = f"bulk{i}_{n}@example.com"
+        data["user_name"] = f"bulkuser{i}_{n}"
+        data["phone"] = f"+7909{n:07d}"
+        payloads.append(data)
+
+    body = _json(payloads)
+    response = await client.post(
+        "/api/v1/users/bulk", content=body, headers=JSON_HEADERS
+    )
+    assert response.status_code == 201
+
+    data = orjson.loads(response.content)
+    assert [user["email"] for user in data] == [p["email"] for p in payloads]
+    assert all("uuid" in user and "hashed_password" not in user for user in data)
+
+    # Повторная вставка тех же email отклоняется
+    response = await client.post(
+        "/api/v1/users/bulk", content=body, headers=JSON_HEADERS
+    )
+    assert response.status_code == 400
+
+
+async def test_create_users_bulk_requires_admin(client, user_data, bulk_users):
+    """Тест: пакетное создание недоступно анонимам и обычным пользователям"""
+    response = await client.post("/api/v1/users/bulk", json=[user_data])
+    assert response.status_code == 401
+
+    await login(client, bulk_users[0]["email"])
+    response = await client.post("/api/v1/users/bulk", json=[user_data])
+    assert response.status_code == 403
 
 
 # ============= ТЕСТЫ ПОЛУЧЕНИЯ ПОЛЬЗОВАТЕЛЯ =============
 
 
-@pytest.mark.asyncio
-async def test_get_user_by_uuid(client, user_data):
+async def test_get_user_by_uuid(client, user_data, created_user):
     """Тест получения пользователя по UUID"""
-    # Создаем пользователя
-    create_response = await client.post("/api/v1/users/", json=user_data)
-    user_uuid = create_response.json()["uuid"]
+    user_uuid = created_user["uuid"]
 
     # Получаем пользователя
     response = await client.get(f"/api/v1/users/{user_uuid}")
     assert response.status_code == 200
 
-    data = response.json()
+    data = orjson.loads(response.content)
     assert data["uuid"] == user_uuid
     assert data["email"] == user_data["email"]
 
 
-@pytest.mark.asyncio
 async def test_get_user_not_found(client):
     """Тест получения несуществующего пользователя"""
     fake_uuid = str(uuid4())
     response = await client.get(f"/api/v1/users/{fake_uuid}")
     assert response.status_code == 404
-    assert "not found" in response.json()["detail"]
+    # Обработчик 404 отдаёт общее сообщение и путь запроса
+    assert b'"error":"Not Found"' in response.content
+    assert fake_uuid.encode() in response.content
 
 
-@pytest.mark.asyncio
 async def test_get_user_invalid_uuid(client):
     """Тест получения пользователя с невалидным UUID"""
     response = await client.get("/api/v1/users/invalid-uuid")
@@ -226,56 +449,101 @@ async def test_get_user_invalid_uuid(client):
 # ============= ТЕСТЫ СПИСКА ПОЛЬЗОВАТЕЛЕЙ =============
 
 
-@pytest.mark.asyncio
-async def test_list_users(client, user_data):
+async def test_list_users(client, bulk_users):
     """Тест получения списка пользователей"""
-    # Создаем несколько пользователей
-    for i in range(3):
-        data = user_data.copy()
-        data["email"] = f"test{i}_{uuid4().hex[:8]}@example.com"
-        data["user_name"] = f"testuser{i}_{uuid4().hex[:8]}"
-        data["phone"] = f"+7909{uuid4().hex[:7]}"
-        await client.post("/api/v1/users/", json=data)
+    await login(client, bulk_users[0]["email"])
 
     # Получаем список
     response = await client.get("/api/v1/users/list")
     assert response.status_code == 200
 
-    data = response.json()
-    assert isinstance(data, list)
-    assert len(data) >= 3
+    data = orjson.loads(response.content)
+    assert [user["email"] for user in data] == [user["email"] for user in bulk_users]
 
 
-@pytest.mark.asyncio
-async def test_list_users_with_pagination(client, user_data):
+async def test_list_users_with_pagination(client, bulk_users):
     """Тест пагинации списка пользователей"""
-    # Создаем пользователей
-    for i in range(5):
-        data = user_data.copy()
-        data["email"] = f"test{i}_{uuid4().hex[:8]}@example.com"
-        data["user_name"] = f"testuser{i}_{uuid4().hex[:8]}"
-        data["phone"] = f"+7909{uuid4().hex[:7]}"
-        await client.post("/api/v1/users/", json=data)
+    await login(client, bulk_users[0]["email"])
 
     # Тест пагинации
     response = await client.get("/api/v1/users/list?skip=0&limit=2")
     assert response.status_code == 200
-    assert len(response.json()) <= 2
+    assert [user["email"] for user in orjson.loads(response.content)] == [
+        user["email"] for user in bulk_users[0:2]
+    ]
 
     response = await client.get("/api/v1/users/list?skip=2&limit=2")
     assert response.status_code == 200
-    assert len(response.json()) <= 2
+    assert [user["email"] for user in orjson.loads(response.content)] == [
+        user["email"] for user in bulk_users[2:4]
+    ]
+
+
+async def test_list_users_page(client, bulk_users):
+    """Тест страницы пользователей с общим количеством"""
+    await login(client, bulk_users[0]["email"])
+
+    response = await client.get("/api/v1/users/page?skip=1&limit=2")
+    assert response.status_code == 200
+
+    data = orjson.loads(response.content)
+    assert data["total"] == len(bulk_users)
+    assert data["skip"] == 1
+    assert data["limit"] == 2
+    assert [user["email"] for user in data["items"]] == [
+        user["email"] for user in bulk_users[1:3]
+    ]
+
+
+# Фикстура для пользователей, сохранённых в БД (видны любому соединению)
+@pytest.fixture
+async def committed_users(test_engine):
+    """Создать и закоммитить 3 пользователей, удалить их после теста"""
+    rows = [
+        {
+            "email": f"committed_{n}@example.com",
+            "user_name": f"committeduser_{n}",
+            "name": "Committed User",
+            "first_name": "Committed",
+            "last_name": "User",
+            "phone": f"+7909{n:07d}",
+            "hashed_password": BULK_PASSWORD_HASH,
+        }
+        for n in itertools.islice(_counter, 3)
+    ]
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(UserModel), rows)
+    yield rows
+    async with test_engine.begin() as conn:
+        await conn.execute(
+            delete(UserModel).where(UserModel.email.in_([r["email"] for r in rows]))
+        )
+
+
+async def test_list_users_page_separate_session(client, test_engine, committed_users):
+    """Тест страницы пользователей, когда COUNT(*) идёт на своём соединении"""
+    # Фабрика на движке, а не на соединении теста: count() и list_light()
+    # выполняются параллельно на разных соединениях, как в production
+    session_factory = async_sessionmaker(test_engine, expire_on_commit=False)
+    app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+    await login(client, committed_users[0]["email"])
+
+    response = await client.get("/api/v1/users/page?skip=1&limit=2")
+    assert response.status_code == 200
+
+    data = orjson.loads(response.content)
+    assert data["total"] == len(committed_users)
+    assert [user["email"] for user in data["items"]] == [
+        user["email"] for user in committed_users[1:3]
+    ]
 
 
 # ============= ТЕСТЫ ОБНОВЛЕНИЯ ПОЛЬЗОВАТЕЛЯ =============
 
 
-@pytest.mark.asyncio
-async def test_update_user(client, user_data):
+async def test_update_user(client, user_data, created_user):
     """Тест обновления пользователя"""
-    # Создаем пользователя
-    create_response = await client.post("/api/v1/users/", json=user_data)
-    user_uuid = create_response.json()["uuid"]
+    user_uuid = created_user["uuid"]
 
     # Обновляем данные
     update_data = {
@@ -286,14 +554,13 @@ async def test_update_user(client, user_data):
     response = await client.patch(f"/api/v1/users/{user_uuid}", json=update_data)
     assert response.status_code == 200
 
-    data = response.json()
+    data = orjson.loads(response.content)
     assert data["first_name"] == "Updated"
     assert data["last_name"] == "Name"
     assert data["phone"] == "+79991111111"
     assert data["email"] == user_data["email"]  # email не изменился
 
 
-@pytest.mark.asyncio
 async def test_update_user_not_found(client):
     """Тест обновления несуществующего пользователя"""
     fake_uuid = str(uuid4())
@@ -302,17 +569,16 @@ async def test_update_user_not_found(client):
     assert response.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_update_user_duplicate_email(client, user_data):
+async def test_update_user_duplicate_email(client, user_data, created_user):
     """Тест обновления с дублирующимся email"""
-    # Создаем двух пользователей
-    response1 = await client.post("/api/v1/users/", json=user_data)
-    user1_uuid = response1.json()["uuid"]
+    user1_uuid = created_user["uuid"]
 
+    # Создаем второго пользователя
+    n = next(_counter)
     user_data2 = user_data.copy()
-    user_data2["email"] = f"another_{uuid4().hex[:8]}@example.com"
-    user_data2["user_name"] = f"another_{uuid4().hex[:8]}"
-    user_data2["phone"] = f"+7909{uuid4().hex[:7]}"
+    user_data2["email"] = f"another_{n}@example.com"
+    user_data2["user_name"] = f"another_{n}"
+    user_data2["phone"] = f"+7909{n:07d}"
     response2 = await client.post("/api/v1/users/", json=user_data2)
 
     # Пытаемся обновить email первого пользователя на email второго
@@ -324,12 +590,9 @@ async def test_update_user_duplicate_email(client, user_data):
 # ============= ТЕСТЫ УДАЛЕНИЯ ПОЛЬЗОВАТЕЛЯ =============
 
 
-@pytest.mark.asyncio
-async def test_delete_user(client, user_data):
+async def test_delete_user(client, created_user):
     """Тест удаления пользователя"""
-    # Создаем пользователя
-    create_response = await client.post("/api/v1/users/", json=user_data)
-    user_uuid = create_response.json()["uuid"]
+    user_uuid = created_user["uuid"]
 
     # Удаляем пользователя
     response = await client.delete(f"/api/v1/users/{user_uuid}")
@@ -340,7 +603,6 @@ async def test_delete_user(client, user_data):
     assert get_response.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_delete_user_not_found(client):
     """Тест удаления несуществующего пользователя"""
     fake_uuid = str(uuid4())
@@ -351,81 +613,43 @@ async def test_delete_user_not_found(client):
 # ============= ТЕСТЫ АКТИВАЦИИ/ДЕАКТИВАЦИИ =============
 
 
-@pytest.mark.asyncio
-async def test_deactivate_user(client, user_data):
-    """Тест деактивации пользователя"""
-    # Создаем пользователя
-    create_response = await client.post("/api/v1/users/", json=user_data)
-    user_uuid = create_response.json()["uuid"]
+async def test_user_activation_lifecycle(client, created_user):
+    """Тест деактивации/активации: active -> inactive -> active с повторами"""
+    user_uuid = created_user["uuid"]
 
     # Деактивируем
     response = await client.post(f"/api/v1/users/{user_uuid}/deactivate")
     assert response.status_code == 200
-    assert response.json()["is_active"] is False
-
+    assert orjson.loads(response.content)["is_active"] is False
 
-@pytest.mark.asyncio
-async def test_activate_user(client, user_data):
-    """Тест активации пользователя"""
-    # Создаем и деактивируем пользователя
-    create_response = await client.post("/api/v1/users/", json=user_data)
-    user_uuid = create_response.json()["uuid"]
-    await client.post(f"/api/v1/users/{user_uuid}/deactivate")
+    # Повторная деактивация уже неактивного пользователя
+    response = await client.post(f"/api/v1/users/{user_uuid}/deactivate")
+    assert response.status_code == 400
 
     # Активируем
     response = await client.post(f"/api/v1/users/{user_uuid}/activate")
     assert response.status_code == 200
-    assert response.json()["is_active"] is True
-
-
-@pytest.mark.asyncio
-async def test_activate_already_active_user(client, user_data):
-    """Тест активации уже активного пользователя"""
-    # Создаем пользователя (по умолчанию активен)
-    create_response = await client.post("/api/v1/users/", json=user_data)
-    user_uuid = create_response.json()["uuid"]
+    assert orjson.loads(response.content)["is_active"] is True
 
-    # Пытаемся активировать
+    # Повторная активация уже активного пользователя
     response = await client.post(f"/api/v1/users/{user_uuid}/activate")
     assert response.status_code == 400
 
 
-@pytest.mark.asyncio
-async def test_deactivate_already_inactive_user(client, user_data):
-    """Тест деактивации уже неактивного пользователя"""
-    # Создаем и деактивируем пользователя
-    create_response = await client.post("/api/v1/users/", json=user_data)
-    user_uuid = create_response.json()["uuid"]
-    await client.post(f"/api/v1/users/{user_uuid}/deactivate")
-
-    # Пытаемся деактивировать снова
-    response = await client.post(f"/api/v1/users/{user_uuid}/deactivate")
-    assert response.status_code == 400
-
-
 # ============= ТЕСТЫ АКТИВНЫХ ПОЛЬЗОВАТЕЛЕЙ =============
 
 
-@pytest.mark.asyncio
-async def test_list_active_users(client, user_data):
+async def test_list_active_users(client, bulk_users):
     """Тест получения списка активных пользователей"""
-    # Создаем активного пользователя
-    response1 = await client.post("/api/v1/users/", json=user_data)
-
-    # Создаем и деактивируем второго пользователя
-    user_data2 = user_data.copy()
-    user_data2["email"] = f"inactive_{uuid4().hex[:8]}@example.com"
-    user_data2["user_name"] = f"inactive_{uuid4().hex[:8]}"
-    user_data2["phone"] = f"+7909{uuid4().hex[:7]}"
-    response2 = await client.post("/api/v1/users/", json=user_data2)
-    user2_uuid = response2.json()["uuid"]
-    await client.post(f"/api/v1/users/{user2_uuid}/deactivate")
-
     # Получаем список активных пользователей
     response = await client.get("/api/v1/users/active")
     assert response.status_code == 200
 
-    active_users = response.json()
+    active_users = orjson.loads(response.content)
     # Все пользователи в списке должны быть активными
     for user in active_users:
         assert user["is_active"] is True
+    # В список попали все активные, неактивный (последний) - нет
+    assert [user["email"] for user in active_users] == [
+        user["email"] for user in bulk_users[:-1]
+    ]